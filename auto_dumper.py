@@ -1,31 +1,47 @@
 import os
 import time
+import asyncio
+import signal
 import logging
-import json
-import schedule
-from dotenv import load_dotenv
+import logging.handlers
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 import telegram
 import sys
 import funpayapi
 from funpayapi import Account
 
 # Configure logging
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# File writes are buffered and flushed every 64 records or on errors
+file_handler = logging.FileHandler("auto_dumper.log")
+file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+memory_handler = logging.handlers.MemoryHandler(64, flushLevel=logging.ERROR, target=file_handler)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler("auto_dumper.log"),
+        memory_handler,
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
+# Load environment variables from .env unless they are already set,
+# e.g. injected by a container
+if os.getenv("TELEGRAM_TOKEN") is None:
+    from dotenv import load_dotenv
+    load_dotenv()
 
 # Configuration (can be moved to config.json later)
 CONFIG = {
     "check_interval_minutes": 10,
+    "min_check_interval_minutes": 2,  # Нижняя граница адаптивного интервала
+    "max_check_interval_minutes": 60,  # Верхняя граница адаптивного интервала
+    "market_cache_ttl_seconds": None,  # По умолчанию половина интервала проверки
+    "notification_batch_size": 10,  # Сколько уведомлений объединять в одно сообщение
+    "notification_max_wait_seconds": 60,  # Максимальная задержка уведомления
     "price_decrease_amount": 1,  # ₽
     "min_price": 0,  # Will be set from config file
     "telegram_token": os.getenv("TELEGRAM_TOKEN"),
@@ -38,58 +54,285 @@ CONFIG = {
     "whitelist": []  # Будет установлено из файла конфигурации
 }
 
+# Telegram message sent after a successful price update
+NOTIFY_TMPL = (
+    "✅ Цена успешно понижена!\n"
+    "Старая цена: {old}₽\n"
+    "Новая цена: {new}₽\n"
+    "Кого задампил: {who} ({their}₽)"
+)
+
+# Pauses between retries of a FunPay call that failed with a network error
+NETWORK_RETRY_DELAYS = (0.5, 1, 2)
+# HTTP statuses that mean the FunPay session is no longer valid. A 403 may
+# also be an anti-bot block, so new logins are spaced out by RELOGIN_BACKOFF_*
+AUTH_ERROR_STATUSES = (401, 403)
+# Failed market fetches in a row (not network errors) after which we log in again
+MAX_FAILED_CALLS = 3
+# Pause before logging in again after the session was dropped, in seconds.
+# Doubles every time the new session fails too, up to the maximum
+RELOGIN_BACKOFF_MIN = 300
+RELOGIN_BACKOFF_MAX = 3600
+
+def is_auth_error(error):
+    """Check whether an exception means the FunPay session has expired"""
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) in AUTH_ERROR_STATUSES
+
+def parse_price(price):
+    """
+    Return a lot price that can be compared with other prices, or None if
+    it is missing or not a number. Numeric prices are returned unchanged,
+    anything else (e.g. a string) is converted to float
+    """
+    if isinstance(price, (int, float)):
+        return price
+    try:
+        return float(price)
+    except (TypeError, ValueError):
+        return None
+
+def create_http_adapter():
+    """
+    Create a pooled HTTP adapter to reuse connections to FunPay.
+    Network errors are retried by PriceDumper._call_funpay, not here
+    """
+    return HTTPAdapter(pool_connections=4, pool_maxsize=8)
+
 class PriceDumper:
     def __init__(self, config):
         self.config = config
+        # Config files are merged onto the defaults, so removing a key from
+        # config.json restores its default instead of keeping the old value
+        self._default_config = dict(config)
         self.bot = None
         self.funpay_account = None
+        self.http_adapter = create_http_adapter()
+        self.last_successful_ts = None  # time.monotonic() последнего успешного запроса к FunPay
+        self._failed_calls = 0
+        self._relogin_backoff = RELOGIN_BACKOFF_MIN
+        self._relogin_not_before = 0.0  # time.monotonic(), раньше которого не логинимся заново
+        self._mp_cache = (0.0, None)  # (время получения, лоты)
+        self._pending_msgs = []
+        self._notify_tasks = set()  # Уведомления, отправляемые в фоне
+        self._last_lots_hash = None  # Хеш (id, цена) лотов с прошлой проверки
+        self._config_path = None
+        self._config_mtime = None
+        
+        # Adaptive check interval state, set up by _cache_derived_config
+        self._base_interval = None
+        
+        self._cache_derived_config(config)
         
         # Initialize Telegram bot if credentials are provided
         if config["telegram_token"] and config["telegram_chat_id"]:
             self.bot = telegram.Bot(token=config["telegram_token"])
             logger.info("Telegram bot initialized")
         else:
-            logger.warning("Telegram credentials not provided, notifications disabled")
+            logger.warning("Telegram credentials not provided")
+        self._bind_notification_sender()
+    
+    def _bind_notification_sender(self):
+        """Pick the notification sender once instead of checking the bot on every call"""
+        if self.bot:
+            self.send_telegram_notification = self._send_real
+        else:
+            logger.warning("Telegram bot not initialized, notifications will be skipped")
+            self.send_telegram_notification = self._send_noop
+    
+    def disable_notifications(self):
+        """Stop sending Telegram notifications"""
+        self.bot = None
+        self._pending_msgs = []
+        self._bind_notification_sender()
     
     def load_config_file(self, config_path="config.json"):
         """Load configuration from a JSON file"""
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                user_config = json.load(f)
+            # Remember the file version before reading so a write made
+            # during the read is picked up by the next reload check
+            mtime = os.path.getmtime(config_path)
+            with open(config_path, 'rb') as f:
+                user_config = orjson.loads(f.read())
                 
-            # Update config with values from file
-            for key, value in user_config.items():
-                if key in self.config:
-                    self.config[key] = value
-            
-            logger.info(f"Configuration loaded from {config_path}")
+            # Build the new config on a copy so a rejected file changes nothing
+            new_config = {**self._default_config, **{key: user_config[key] for key in user_config if key in self.config}}
             
             # Validate required settings
             required_fields = ["game_id", "server_id", "lot_id", "min_price"]
             for field in required_fields:
-                if not self.config[field]:
-                    logger.error(f"Required configuration '{field}' is missing or empty")
+                if not new_config[field]:
+                    logger.error("Required configuration '%s' is missing or empty", field)
                     return False
             
+            self._cache_derived_config(new_config)
+            self.config.update(new_config)
+            logger.info("Configuration loaded from %s", config_path)
+            self._config_path = config_path
+            self._config_mtime = mtime
             return True
         except Exception as e:
-            logger.error(f"Failed to load configuration: {e}")
+            logger.error("Failed to load configuration: %s", e)
             return False
     
-    def send_telegram_notification(self, message):
-        """Send a notification to Telegram"""
-        if not self.bot:
-            logger.warning("Telegram bot not initialized, skipping notification")
-            return False
+    def reload_config_if_changed(self):
+        """
+        Reload the configuration file if it was modified since the last load.
+        The FunPay session is kept, only the settings are updated
+        """
+        if self._config_path is None:
+            return
         
         try:
-            self.bot.send_message(chat_id=self.config["telegram_chat_id"], text=message)
-            logger.info("Telegram notification sent")
+            mtime = os.path.getmtime(self._config_path)
+        except OSError as e:
+            logger.warning("Failed to check configuration file: %s", e)
+            return
+        
+        if mtime != self._config_mtime:
+            logger.info("Configuration file changed, reloading")
+            if self.load_config_file(self._config_path):
+                # Cached lots may belong to another game, server or lot,
+                # and unchanged lots have to be evaluated with the new settings
+                self._mp_cache = (0.0, None)
+                self._last_lots_hash = None
+    
+    def _cache_derived_config(self, config):
+        """
+        Coerce numeric settings in config and precompute values used on every
+        price check. Everything is computed before anything is assigned, so a
+        config with invalid values raises and leaves the old state intact
+        """
+        min_price = float(config["min_price"])
+        decrease = float(config["price_decrease_amount"])
+        check_interval_minutes = float(config["check_interval_minutes"])
+        min_check_interval_minutes = float(config["min_check_interval_minutes"])
+        max_check_interval_minutes = float(config["max_check_interval_minutes"])
+        market_cache_ttl_seconds = config["market_cache_ttl_seconds"]
+        if market_cache_ttl_seconds is not None:
+            market_cache_ttl_seconds = float(market_cache_ttl_seconds)
+        notification_batch_size = int(config["notification_batch_size"])
+        notification_max_wait_seconds = float(config["notification_max_wait_seconds"])
+        
+        # Zero or negative intervals would make the loops spin
+        for key, value in (
+            ("check_interval_minutes", check_interval_minutes),
+            ("min_check_interval_minutes", min_check_interval_minutes),
+            ("max_check_interval_minutes", max_check_interval_minutes),
+            ("notification_batch_size", notification_batch_size),
+            ("notification_max_wait_seconds", notification_max_wait_seconds),
+        ):
+            if not value > 0:
+                raise ValueError(f"'{key}' must be positive, got {value}")
+        
+        if not isinstance(config["whitelist"], list):
+            raise TypeError("'whitelist' must be a list")
+        # Whitelist is only used for membership checks. IDs and names share
+        # one set of strings, so IDs written as numbers in config.json match too
+        whitelist = frozenset(map(str, config["whitelist"]))
+        my_lot_id = config["lot_id"]
+        base_interval = check_interval_minutes * 60
+        
+        config.update({
+            "min_price": min_price,
+            "price_decrease_amount": decrease,
+            "check_interval_minutes": check_interval_minutes,
+            "min_check_interval_minutes": min_check_interval_minutes,
+            "max_check_interval_minutes": max_check_interval_minutes,
+            "market_cache_ttl_seconds": market_cache_ttl_seconds,
+            "notification_batch_size": notification_batch_size,
+            "notification_max_wait_seconds": notification_max_wait_seconds,
+        })
+        self._my_lot_id = my_lot_id
+        self._min_price = min_price
+        self._decrease = decrease
+        self._whitelist = whitelist
+        
+        # Start adapting from the configured interval, keeping the adaptive
+        # state when an unrelated setting changes
+        if base_interval != self._base_interval:
+            self._base_interval = base_interval
+            self.check_interval = base_interval
+            self._last_cheapest = None
+            self._stable_streak = 0
+    
+    def market_cache_ttl(self):
+        """Seconds for which fetched market prices are reused"""
+        ttl = self.config["market_cache_ttl_seconds"]
+        if ttl is None:
+            ttl = self.check_interval / 2
+        return ttl
+    
+    def adapt_check_interval(self, cheapest_price):
+        """
+        Back off while the cheapest competitor price stays the same and
+        check more often when it changes
+        """
+        base_interval = self.config["check_interval_minutes"] * 60
+        min_interval = min(self.config["min_check_interval_minutes"] * 60, base_interval)
+        max_interval = max(self.config["max_check_interval_minutes"] * 60, base_interval)
+        
+        if cheapest_price == self._last_cheapest:
+            self._stable_streak += 1
+            if self._stable_streak >= 3:
+                self.check_interval = min(self.check_interval * 2, max_interval)
+                self._stable_streak = 0
+        else:
+            self._stable_streak = 0
+            if self._last_cheapest is not None:
+                self.check_interval = max(self.check_interval // 2, min_interval)
+            self._last_cheapest = cheapest_price
+        
+        logger.info("Next check in %g minutes", self.check_interval / 60)
+    
+    async def _send_noop(self, message):
+        """Notification sender used when the Telegram bot is not available"""
+        return False
+    
+    async def _send_real(self, message):
+        """
+        Queue a notification for Telegram. Queued notifications are sent
+        as one message when the batch is full or by the flush loop
+        """
+        self._pending_msgs.append(message)
+        if len(self._pending_msgs) >= self.config["notification_batch_size"]:
+            return await self.flush_notifications()
+        return True
+    
+    async def flush_notifications(self):
+        """Send all queued notifications to Telegram as one message"""
+        if not self.bot or not self._pending_msgs:
             return True
-        except Exception as e:
-            logger.error(f"Failed to send Telegram notification: {e}")
+        
+        messages = self._pending_msgs
+        self._pending_msgs = []
+        try:
+            # The bot keeps one HTTP connection pool for the whole process
+            await self.bot.send_message(chat_id=self.config["telegram_chat_id"], text="\n\n".join(messages))
+            logger.info("Telegram notification sent (%d messages)", len(messages))
+            return True
+        except telegram.error.TelegramError as e:
+            logger.error("Failed to send Telegram notification: %s", e)
             return False
     
+    def send_telegram_notification_in_background(self, message):
+        """Send a notification without waiting for Telegram"""
+        task = asyncio.create_task(self.send_telegram_notification(message))
+        # Keep a reference until the task is done so it is not garbage collected
+        self._notify_tasks.add(task)
+        task.add_done_callback(self._notify_tasks.discard)
+    
+    async def wait_for_notifications(self):
+        """Wait for notifications that are being sent in the background"""
+        if self._notify_tasks:
+            await asyncio.gather(*self._notify_tasks, return_exceptions=True)
+    
+    async def flush_notifications_forever(self):
+        """Flush queued notifications every notification_max_wait_seconds"""
+        while True:
+            await asyncio.sleep(self.config["notification_max_wait_seconds"])
+            await self.flush_notifications()
+    
     def login_to_funpay(self):
         """Log in to FunPay using credentials"""
         try:
@@ -102,73 +345,136 @@ class PriceDumper:
                 self.config["funpay_username"],
                 self.config["funpay_password"]
             )
+            # Reuse one connection pool for all FunPay requests. The pool is
+            # mounted on the account's own session to keep its auth cookies
+            session = getattr(self.funpay_account, "session", None)
+            if isinstance(session, requests.Session):
+                session.mount("https://", self.http_adapter)
+            else:
+                logger.info("FunPayAPI account has no requests session, connection pooling disabled")
+            self.last_successful_ts = time.monotonic()
+            self._failed_calls = 0
             
-            logger.info(f"Successfully logged in to FunPay as {self.config['funpay_username']}")
+            logger.info("Successfully logged in to FunPay as %s", self.config["funpay_username"])
             return True
         except Exception as e:
-            logger.error(f"Failed to log in to FunPay: {e}")
+            logger.error("Failed to log in to FunPay: %s", e)
             return False
     
+    def _is_session_alive(self):
+        """
+        Check whether the current FunPay session can still be used.
+        The session is dropped on auth errors and after MAX_FAILED_CALLS
+        failed market fetches of unknown cause
+        """
+        return self.funpay_account is not None
+    
+    def _drop_session(self):
+        """Forget the FunPay session and delay the next login"""
+        self.funpay_account = None
+        self._failed_calls = 0
+        self._relogin_not_before = time.monotonic() + self._relogin_backoff
+        logger.warning("Will log in to FunPay again in %d seconds", self._relogin_backoff)
+        self._relogin_backoff = min(self._relogin_backoff * 2, RELOGIN_BACKOFF_MAX)
+    
+    def _call_funpay(self, method, *args, session_probe=False):
+        """
+        Call a FunPayAPI method, retrying network errors with backoff.
+        On auth errors the session is dropped so a later check logs in again.
+        Other failures count towards MAX_FAILED_CALLS only for session probes
+        (the market fetch): an update may fail because FunPay rejected the
+        price itself, which says nothing about the session
+        """
+        for delay in NETWORK_RETRY_DELAYS + (None,):
+            try:
+                result = method(*args)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if delay is None:
+                    raise
+                logger.warning("Network error while calling FunPay, retrying in %ss: %s", delay, e)
+                time.sleep(delay)
+                continue
+            except Exception as e:
+                if is_auth_error(e):
+                    logger.warning("FunPay session expired: %s", e)
+                    self._drop_session()
+                elif session_probe:
+                    self._failed_calls += 1
+                    if self._failed_calls >= MAX_FAILED_CALLS:
+                        logger.warning("FunPay requests keep failing, treating the session as expired")
+                        self._drop_session()
+                raise
+            
+            self.last_successful_ts = time.monotonic()
+            self._failed_calls = 0
+            self._relogin_backoff = RELOGIN_BACKOFF_MIN
+            return result
+    
     def get_market_prices(self):
         """
         Получить список всех продавцов и цен для определенного лота
-        Возвращает список словарей с seller_id, seller_name и price
+        Возвращает кортеж (лоты, из_кеша): список лотов FunPayAPI
+        (id, user_id, user_name, price) и признак того, что он взят из кеша
         """
         try:
             if not self.funpay_account:
                 logger.error("Not logged in to FunPay")
-                return []
+                return [], False
+            
+            # Повторно используем недавно полученные лоты
+            now = time.monotonic()
+            fetched_at, cached_lots = self._mp_cache
+            if cached_lots is not None and now - fetched_at < self.market_cache_ttl():
+                logger.info("Using cached market prices (%d sellers)", len(cached_lots))
+                return cached_lots, True
             
             # Получаем все лоты для указанной игры и сервера
             game_id = self.config["game_id"]
             server_id = self.config["server_id"]
             
             # Используем FunPayAPI для получения списка лотов
-            all_lots = self.funpay_account.get_lots(game_id, server_id)
-            
-            sellers = []
-            for lot in all_lots:
-                # Извлекаем данные о продавце и цене
-                sellers.append({
-                    'seller_id': lot.user_id,  # ID продавца
-                    'seller_name': lot.user_name,  # Имя продавца
-                    'price': float(lot.price),  # Цена
-                    'lot_id': lot.id  # ID лота
-                })
+            # Лоты возвращаются как есть, без копирования в промежуточные словари
+            all_lots = self._call_funpay(self.funpay_account.get_lots, game_id, server_id, session_probe=True)
             
-            logger.info(f"Found {len(sellers)} sellers on the market")
-            return sellers
+            logger.info("Found %d sellers on the market", len(all_lots))
+            if all_lots:
+                self._mp_cache = (now, all_lots)
+            return all_lots, False
             
         except Exception as e:
-            logger.error(f"Failed to get market prices: {e}")
-            return []
-    
-    def find_my_listing(self, sellers):
-        """Find my listing among all sellers"""
-        my_lot_id = self.config["lot_id"]
-        for seller in sellers:
-            if seller['lot_id'] == my_lot_id:
-                return seller
-        return None
+            logger.error("Failed to get market prices: %s", e)
+            return [], False
     
-    def find_cheapest_competitor(self, sellers):
-        """Find the cheapest competitor not in the whitelist"""
+    def find_listings(self, all_lots):
+        """
+        Find my lot and the cheapest competitor lot not in the whitelist
+        in a single pass. Returns a (my_listing, cheapest) tuple
+        """
+        my_listing = None
         cheapest = None
-        my_lot_id = self.config["lot_id"]
-        
-        for seller in sellers:
-            # Skip if it's my listing
-            if seller['lot_id'] == my_lot_id:
+        cheapest_price = None
+        my_lot_id = self._my_lot_id
+        whitelist = self._whitelist
+        # Numeric prices are compared as returned by FunPayAPI, other types
+        # are converted per lot, and lots without a valid price are skipped
+        for lot in all_lots:
+            if lot.id == my_lot_id:
+                my_listing = lot
                 continue
                 
             # Skip if in whitelist
-            if seller['seller_id'] in self.config["whitelist"] or seller['seller_name'] in self.config["whitelist"]:
+            if str(lot.user_id) in whitelist or lot.user_name in whitelist:
                 continue
                 
-            if cheapest is None or seller['price'] < cheapest['price']:
-                cheapest = seller
+            price = parse_price(lot.price)
+            if price is None:
+                logger.warning("Skipping lot %s with invalid price %r", lot.id, lot.price)
+                continue
+            if cheapest_price is None or price < cheapest_price:
+                cheapest = lot
+                cheapest_price = price
                 
-        return cheapest
+        return my_listing, cheapest
     
     def update_my_price(self, new_price):
         """
@@ -179,74 +485,151 @@ class PriceDumper:
                 logger.error("Not logged in to FunPay")
                 return False
             
-            # Получаем ID лота
-            lot_id = self.config["lot_id"]
-            
             # Используем API для обновления цены
-            self.funpay_account.change_lot_price(lot_id, new_price)
+            self._call_funpay(self.funpay_account.change_lot_price, self._my_lot_id, new_price)
             
-            logger.info(f"Price updated to {new_price}₽")
+            logger.info("Price updated to %s₽", new_price)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to update price: {e}")
+            logger.error("Failed to update price: %s", e)
             return False
     
-    def check_and_update_price(self):
+    async def check_and_update_price(self):
         """Main function to check prices and update if needed"""
         logger.info("Checking market prices...")
         
-        # Ensure we're logged in
-        if not self.funpay_account:
-            if not self.login_to_funpay():
+        # Apply configuration changes without restarting
+        self.reload_config_if_changed()
+        
+        # Ensure we're logged in, reusing the session while it works
+        if not self._is_session_alive():
+            wait = self._relogin_not_before - time.monotonic()
+            if wait > 0:
+                logger.info("Skipping price check, next FunPay login allowed in %.0f seconds", wait)
+                return
+            if self.last_successful_ts is not None:
+                logger.info(
+                    "Logging in to FunPay again, last successful request was %.0f seconds ago",
+                    time.monotonic() - self.last_successful_ts
+                )
+            if not await asyncio.to_thread(self.login_to_funpay):
                 logger.error("Failed to log in to FunPay, aborting price check")
                 return
         
-        # Get all sellers and prices
-        sellers = self.get_market_prices()
-        if not sellers:
+        # Get all lots and prices
+        # Cached lots carry no new market data, so they do not count towards
+        # the adaptive interval
+        all_lots, from_cache = await asyncio.to_thread(self.get_market_prices)
+        if not all_lots:
             logger.warning("No sellers found or failed to get prices")
             return
         
-        # Find my listing
-        my_listing = self.find_my_listing(sellers)
+        # Nothing to do if no lot appeared, disappeared or changed its price
+        # since a check that decided no action was needed
+        lots_hash = hash(tuple((lot.id, lot.price) for lot in all_lots))
+        if lots_hash == self._last_lots_hash:
+            logger.info("Market unchanged since the last check, no action needed")
+            if self._last_cheapest is not None and not from_cache:
+                self.adapt_check_interval(self._last_cheapest)
+            return
+        # Only remembered below once the same lots are known to need no action
+        self._last_lots_hash = None
+        
+        # Find my listing and cheapest competitor
+        my_listing, cheapest_competitor = self.find_listings(all_lots)
         if not my_listing:
-            logger.warning(f"My listing (lot ID: {self.config['lot_id']}) not found")
+            logger.warning("My listing (lot ID: %s) not found", self._my_lot_id)
+            self._last_lots_hash = lots_hash
             return
         
-        logger.info(f"My current price: {my_listing['price']}₽")
+        my_price = parse_price(my_listing.price)
+        if my_price is None:
+            logger.warning("My listing has an invalid price %r, aborting price check", my_listing.price)
+            return
+        my_price = float(my_price)
+        logger.info("My current price: %s₽", my_price)
         
-        # Find cheapest competitor
-        cheapest_competitor = self.find_cheapest_competitor(sellers)
         if not cheapest_competitor:
             logger.info("No competitors found (all sellers are in whitelist)")
+            self._last_lots_hash = lots_hash
             return
         
-        logger.info(f"Cheapest competitor: {cheapest_competitor['seller_name']} with price {cheapest_competitor['price']}₽")
+        # Already validated by find_listings
+        competitor_price = float(parse_price(cheapest_competitor.price))
+        logger.info("Cheapest competitor: %s with price %s₽", cheapest_competitor.user_name, competitor_price)
+        if not from_cache:
+            self.adapt_check_interval(competitor_price)
         
         # Check if my price is already the cheapest
-        if my_listing['price'] <= cheapest_competitor['price']:
+        if my_price <= competitor_price:
             logger.info("My price is already the cheapest, no action needed")
+            self._last_lots_hash = lots_hash
             return
         
         # Calculate new price
-        new_price = cheapest_competitor['price'] - self.config["price_decrease_amount"]
+        new_price = competitor_price - self._decrease
         
         # Check minimum price
-        if new_price < self.config["min_price"]:
-            logger.warning(f"New price ({new_price}₽) would be below minimum price ({self.config['min_price']}₽)")
-            new_price = self.config["min_price"]
+        if new_price < self._min_price:
+            logger.warning("New price (%s₽) would be below minimum price (%s₽)", new_price, self._min_price)
+            new_price = self._min_price
             
         # Update price
-        if self.update_my_price(new_price):
+        if await asyncio.to_thread(self.update_my_price, new_price):
+            # Cached lots still hold my old price
+            self._mp_cache = (0.0, None)
+            
             # Send notification
-            notification_message = (
-                f"✅ Цена успешно понижена!\n"
-                f"Старая цена: {my_listing['price']}₽\n"
-                f"Новая цена: {new_price}₽\n"
-                f"Кого задампил: {cheapest_competitor['seller_name']} ({cheapest_competitor['price']}₽)"
+            notification_message = NOTIFY_TMPL.format(
+                old=my_price,
+                new=new_price,
+                who=cheapest_competitor.user_name,
+                their=competitor_price
             )
-            self.send_telegram_notification(notification_message)
+            # Do not hold up the check loop while Telegram is contacted
+            self.send_telegram_notification_in_background(notification_message)
+
+async def run_forever(dumper):
+    """Run price checks forever, one check per interval"""
+    loop = asyncio.get_running_loop()
+    
+    # Stop gracefully on SIGTERM so queued notifications are still sent
+    try:
+        loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass  # Not supported on Windows
+    
+    if dumper.bot:
+        try:
+            await dumper.bot.initialize()
+        except telegram.error.TelegramError as e:
+            logger.error("Failed to initialize Telegram bot: %s", e)
+            dumper.disable_notifications()
+    
+    flush_task = asyncio.create_task(dumper.flush_notifications_forever())
+    try:
+        await dumper.send_telegram_notification("🚀 Авто-дампер запущен и мониторит цены!")
+        await dumper.flush_notifications()
+        
+        while True:
+            # The interval may change during the check, so sleep only for
+            # what is left of it afterwards; a slow check does not push
+            # subsequent ticks further back
+            started_at = loop.time()
+            try:
+                await dumper.check_and_update_price()
+            except Exception:
+                # One failed check must not stop the auto-dumper
+                logger.exception("Price check failed, will retry on the next check")
+            elapsed = loop.time() - started_at
+            await asyncio.sleep(max(0, dumper.check_interval - elapsed))
+    finally:
+        flush_task.cancel()
+        await dumper.wait_for_notifications()
+        await dumper.flush_notifications()
+        if dumper.bot:
+            await dumper.bot.shutdown()
 
 def main():
     dumper = PriceDumper(CONFIG)
@@ -261,19 +644,15 @@ def main():
         logger.error("Failed to login to FunPay, exiting")
         return
     
-    # Schedule the price checking task
-    schedule.every(CONFIG["check_interval_minutes"]).minutes.do(dumper.check_and_update_price)
-    
-    logger.info(f"Auto-dumper started. Checking prices every {CONFIG['check_interval_minutes']} minutes")
-    dumper.send_telegram_notification("🚀 Авто-дампер запущен и мониторит цены!")
-    
-    # Initial check
-    dumper.check_and_update_price()
+    logger.info("Auto-dumper started. Checking prices every %s minutes", CONFIG["check_interval_minutes"])
     
-    # Main loop
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    # Main loop (the first check runs immediately)
+    try:
+        asyncio.run(run_forever(dumper))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        logger.info("Auto-dumper stopped")
+    finally:
+        memory_handler.flush()
 
 if __name__ == "__main__":
     main() 